@@ -1,5 +1,5 @@
 # 扩展的Material Icons列表（首字母大写）
-material_icons = [
+MATERIAL_ICONS = (
     'Home', 'Search', 'Menu', 'Close', 'Add', 'Remove', 'Edit', 'Delete',
     'Save', 'Share', 'Favorite', 'Star', 'Bookmark', 'Settings', 'Help',
     'Info', 'Warning', 'Error', 'Check', 'Cancel', 'Arrow_back', 'Arrow_forward',
@@ -20,70 +20,269 @@ material_icons = [
     'Language', 'Translate', 'G_translate', 'Link', 'Unlink', 'Attachment',
     'File_upload', 'File_download', 'Cloud_upload', 'Cloud_download',
     'Cloud_off', 'Cloud_queue', 'Cloud_done', 'Cloud_sync',
-]
+)
 
 import os
+import asyncio
+import glob
+import hashlib
+import logging
+import shutil
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from PIL import Image
-import io
+
+try:
+    import aiohttp
+except ImportError:
+    # 未安装aiohttp时退回到逐个同步下载
+    aiohttp = None
+
+try:
+    from tqdm import tqdm
+    from tqdm.contrib.logging import logging_redirect_tqdm
+except ImportError:
+    # 未安装tqdm时不显示进度条
+    tqdm = None
+
+log = logging.getLogger("icons")
+
+# 并发下载的最大连接数
+MAX_CONCURRENCY = 10
+
+# 尝试的Material Icons来源（按优先级排列）
+ICON_STYLES = (
+    # Google Material Icons API (PNG)
+    "material",
+    # 备用：Icons8 Material Design
+    "material-outlined",
+    # 备用：Icons8 Material Filled
+    "material-rounded",
+)
+
+# 同步下载共用的会话，对同一主机复用keep-alive连接，避免每个图标重新握手
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=20,
+    max_retries=Retry(total=2, backoff_factor=0.3),
+))
+
+# 下载内容的本地缓存目录，按URL的哈希保存原始响应，重复运行时无需再访问网络
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "dotclient-icons")
+
+# 流式写入缓存时每次读取的字节数
+CHUNK_SIZE = 64 * 1024
+
+def icon_filename(icon_name, size):
+    """返回图标保存时使用的文件名"""
+    return f"{icon_name}_{size}x{size}.png"
+
+@lru_cache(maxsize=1024)
+def icon_urls(icon_name, size):
+    """返回图标的候选下载地址（按优先级排列）"""
+    return tuple(f"https://img.icons8.com/{style}/{size}/{icon_name}.png" for style in ICON_STYLES)
+
+def cache_path(url):
+    """返回URL对应的缓存文件路径"""
+    return os.path.join(CACHE_DIR, hashlib.sha1(url.encode()).hexdigest())
+
+def discard_cache(url):
+    """删除URL的缓存内容（例如缓存的是无法解码的错误页面）"""
+    try:
+        os.remove(cache_path(url))
+    except FileNotFoundError:
+        pass
+
+def clear_cache():
+    """清空本地下载缓存，下次下载时重新从网络获取"""
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+@contextmanager
+def atomic_write(path):
+    """以二进制方式写入文件：先写临时文件，成功后再替换，避免并发或中断时留下不完整的缓存"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            yield f
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def cached_get(url):
+    """
+    获取URL内容，优先使用本地缓存
+    
+    响应体以流的方式直接写入缓存文件，不在内存中保留完整副本
+    
+    Returns:
+        缓存文件路径；请求失败（非200）时返回None
+    """
+    path = cache_path(url)
+    if os.path.exists(path):
+        return path
+    with SESSION.get(url, stream=True, timeout=10) as response:
+        if response.status_code != 200:
+            # 读完错误响应体，连接才能放回连接池复用
+            response.content
+            return None
+        with atomic_write(path) as f:
+            for chunk in response.iter_content(CHUNK_SIZE):
+                f.write(chunk)
+    return path
+
+async def cached_get_async(session, url):
+    """cached_get 的异步版本"""
+    path = cache_path(url)
+    if os.path.exists(path):
+        return path
+    async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+        if response.status != 200:
+            # 读完错误响应体，连接才能放回连接池复用
+            await response.read()
+            return None
+        with atomic_write(path) as f:
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                f.write(chunk)
+    return path
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+def png_header(path):
+    """
+    读取PNG文件的IHDR头信息
+    
+    Returns:
+        (宽, 高, 位深, 颜色类型)；不是PNG文件时返回None
+    """
+    with open(path, "rb") as f:
+        head = f.read(26)
+    if len(head) < 26 or head[:8] != PNG_SIGNATURE or head[12:16] != b'IHDR':
+        return None
+    return struct.unpack('>IIBB', head[16:26])
+
+def save_icon(source_path, output_path, size):
+    """
+    解码下载的图片文件，调整尺寸后保存为PNG
+
+    Args:
+        source_path: 下载的原始图片文件路径
+        output_path: 输出文件路径
+        size: 图标尺寸
+    """
+    # 已经是目标尺寸的8位RGBA PNG时直接复制，跳过解码和重新编码；
+    # 复制前先校验各数据块的CRC，损坏的文件会抛出异常
+    if png_header(source_path) == (size, size, 8, 6):
+        with Image.open(source_path) as img:
+            img.verify()
+        shutil.copyfile(source_path, output_path)
+        return
+    
+    # 验证是否为有效图片
+    with Image.open(source_path) as img:
+        # 调整到指定尺寸（图标缩放幅度很小，双线性插值已足够）；尺寸已匹配时跳过
+        if img.size != (size, size):
+            img = img.resize((size, size), Image.Resampling.BILINEAR)
+        
+        # 确保为RGBA模式（支持透明背景）；已是RGBA时不再复制缓冲区
+        if img.mode != 'RGBA':
+            img = img.convert('RGBA')
+        
+        # 保存为PNG文件（小图标使用最低压缩级别，编码更快，体积差异可忽略）
+        img.save(output_path, "PNG", compress_level=1, optimize=False)
 
 def download_material_icon(icon_name, size=40, output_dir="public/icons"):
     """
-    从Material Icons CDN下载指定图标
+    从Material Icons CDN下载指定图标（输出目录需已存在）
     
     Args:
         icon_name: 图标名称
         size: 图标尺寸 (默认40x40)
         output_dir: 输出目录
     """
-    # 确保输出目录存在
-    os.makedirs(output_dir, exist_ok=True)
+    output_path = os.path.join(output_dir, icon_filename(icon_name, size))
     
-    # 检查文件是否已存在
-    output_path = os.path.join(output_dir, f"{icon_name}_{size}x{size}.png")
-    if os.path.exists(output_path):
-        print(f"⏭ 跳过: {icon_name} (文件已存在)")
-        return True
-    
-    # 尝试多个Material Icons来源
-    urls = [
-        # Google Material Icons API (PNG)
-        f"https://img.icons8.com/material/{size}/{icon_name}.png",
-        # 备用：Icons8 Material Design
-        f"https://img.icons8.com/material-outlined/{size}/{icon_name}.png",
-        # 备用：Icons8 Material Filled
-        f"https://img.icons8.com/material-rounded/{size}/{icon_name}.png"
-    ]
-    
-    for i, url in enumerate(urls):
+    for i, url in enumerate(icon_urls(icon_name, size)):
         try:
             # 下载图标文件
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                # 验证是否为有效图片
-                img = Image.open(io.BytesIO(response.content))
+            source_path = cached_get(url)
+            if source_path is not None:
+                save_icon(source_path, output_path, size)
                 
-                # 调整到指定尺寸
-                img = img.resize((size, size), Image.Resampling.LANCZOS)
+                log.debug(f"✓ 已下载: {icon_name} (来源: {i+1})")
+                return True
                 
-                # 确保为RGBA模式（支持透明背景）
-                if img.mode != 'RGBA':
-                    img = img.convert('RGBA')
+        except Exception:
+            # 缓存的内容无效（如返回200的错误页面）时删除，下次运行重新下载
+            discard_cache(url)
+            continue
+    
+    # 如果所有来源都失败，不创建占位符
+    log.warning(f"✗ 下载失败: {icon_name}")
+    return False
+
+async def download_material_icon_async(session, icon_name, size, sem, executor, output_dir="public/icons"):
+    """
+    download_material_icon 的异步版本，供批量并发下载使用
+    
+    Args:
+        session: 共享的 aiohttp.ClientSession
+        icon_name: 图标名称
+        size: 图标尺寸
+        sem: 限制并发数的 asyncio.Semaphore
+        executor: 执行PIL解码/缩放/保存的线程池
+        output_dir: 输出目录
+    """
+    output_path = os.path.join(output_dir, icon_filename(icon_name, size))
+    
+    async with sem:
+        for i, url in enumerate(icon_urls(icon_name, size)):
+            try:
+                source_path = await cached_get_async(session, url)
+                if source_path is None:
+                    continue
                 
-                # 保存为PNG文件
-                img.save(output_path, "PNG")
+                # PIL解码/缩放/保存放到线程池中执行，避免阻塞事件循环
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(executor, save_icon, source_path, output_path, size)
                 
-                print(f"✓ 已下载: {icon_name} (来源: {i+1})")
+                log.debug(f"✓ 已下载: {icon_name} (来源: {i+1})")
                 return True
                 
-        except Exception as e:
-            continue
+            except Exception:
+                # 缓存的内容无效（如返回200的错误页面）时删除，下次运行重新下载
+                discard_cache(url)
+                continue
     
     # 如果所有来源都失败，不创建占位符
-    print(f"✗ 下载失败: {icon_name}")
+    log.warning(f"✗ 下载失败: {icon_name}")
     return False
 
-def download_all_icons(icon_list, size=40, clear_existing=True):
+async def download_icons_async(icon_list, size, output_dir, progress=None):
+    """并发下载所有图标，返回与 icon_list 一一对应的结果列表"""
+    sem = asyncio.Semaphore(MAX_CONCURRENCY)
+    connector = aiohttp.TCPConnector(limit=MAX_CONCURRENCY)
+    # 下载与解码流水线并行：一个图标等待网络时，另一个图标可在线程池中解码
+    # （PIL在libpng/zlib调用期间会释放GIL）
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        async with aiohttp.ClientSession(connector=connector) as session:
+            async def download(icon_name):
+                ok = await download_material_icon_async(session, icon_name, size, sem, executor, output_dir)
+                if progress is not None:
+                    progress.update(1)
+                return ok
+            
+            return await asyncio.gather(*[download(icon_name) for icon_name in icon_list])
+
+def download_all_icons(icon_list, size=40, clear_existing=True, refresh_cache=False):
     """
     批量下载图标
     
@@ -91,53 +290,85 @@ def download_all_icons(icon_list, size=40, clear_existing=True):
         icon_list: 图标名称列表
         size: 图标尺寸
         clear_existing: 是否清除现有图标文件
+        refresh_cache: 是否清空下载缓存，重新从网络获取所有图标
     """
     output_dir = "public/icons"
     
+    if refresh_cache:
+        log.info(f"正在清空下载缓存: {CACHE_DIR}")
+        clear_cache()
+    
     # 如果需要，清除现有的图标文件
     if clear_existing and os.path.exists(output_dir):
-        print("正在清除现有图标文件...")
-        for filename in os.listdir(output_dir):
-            if filename.endswith('.png'):
-                file_path = os.path.join(output_dir, filename)
-                try:
-                    os.remove(file_path)
-                    print(f"删除: {filename}")
-                except Exception as e:
-                    print(f"删除失败 {filename}: {e}")
-        print("清除完成。\n")
-    
-    print(f"开始下载 {len(icon_list)} 个图标 ({size}x{size})")
-    
-    success_count = 0
-    failed_icons = []
-    
-    for icon_name in icon_list:
-        if download_material_icon(icon_name, size):
-            success_count += 1
-        else:
-            failed_icons.append(icon_name)
-    
-    print(f"\n下载完成: {success_count}/{len(icon_list)} 个图标成功")
+        log.info("正在清除现有图标文件...")
+        removed = 0
+        for file_path in glob.iglob(os.path.join(output_dir, '*.png')):
+            try:
+                os.unlink(file_path)
+                removed += 1
+            except OSError as e:
+                log.warning(f"删除失败 {os.path.basename(file_path)}: {e}")
+        log.info(f"清除完成，删除 {removed} 个文件。\n")
+    
+    log.info(f"开始下载 {len(icon_list)} 个图标 ({size}x{size})")
+    
+    # 确保输出目录存在，并一次性列出已存在的文件
+    os.makedirs(output_dir, exist_ok=True)
+    existing = set(os.listdir(output_dir))
+    
+    pending = [icon_name for icon_name in icon_list if icon_filename(icon_name, size) not in existing]
+    if len(pending) < len(icon_list):
+        log.info(f"⏭ 跳过 {len(icon_list) - len(pending)} 个已存在的图标")
+    
+    # 进度条显示期间，日志经由tqdm.write输出，避免打断进度条
+    redirect = logging_redirect_tqdm() if tqdm is not None else nullcontext()
+    with redirect:
+        progress = tqdm(total=len(pending), unit="icon") if tqdm is not None else None
+        try:
+            if aiohttp is not None:
+                results = asyncio.run(download_icons_async(pending, size, output_dir, progress))
+            else:
+                results = []
+                for icon_name in pending:
+                    results.append(download_material_icon(icon_name, size, output_dir))
+                    if progress is not None:
+                        progress.update(1)
+        finally:
+            if progress is not None:
+                progress.close()
+    
+    failed_icons = [icon_name for icon_name, ok in zip(pending, results) if not ok]
+    success_count = len(icon_list) - len(failed_icons)
+    
+    log.info(f"\n下载完成: {success_count}/{len(icon_list)} 个图标成功")
     
     if failed_icons:
-        print(f"失败的图标: {', '.join(failed_icons)}")
+        log.warning(f"失败的图标: {', '.join(failed_icons)}")
     
     return success_count, failed_icons
 
 if __name__ == "__main__":
     import argparse
     
-    parser = argparse.ArgumentParser(description='下载Material Icons图标')
+    parser = argparse.ArgumentParser(
+        description='下载Material Icons图标',
+        epilog=f'下载的原始图片缓存在 {CACHE_DIR}，重复运行时直接使用缓存；'
+               '使用 --refresh 重新从网络获取。',
+    )
     parser.add_argument('--size', type=int, default=40, help='图标尺寸 (默认: 40)')
     parser.add_argument('--no-clear', action='store_true', help='不清除现有的图标文件')
+    parser.add_argument('--refresh', action='store_true', help=f'清空下载缓存 ({CACHE_DIR}) 并重新下载')
     
     args = parser.parse_args()
     
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     # 选择要下载的图标列表
-    icons_to_download = material_icons
-    print("下载完整的Material Icons列表...")
+    icons_to_download = MATERIAL_ICONS
+    log.info("下载完整的Material Icons列表...")
     
     # 下载指定尺寸的图标
     clear_existing = not args.no_clear
-    success_count, failed_icons = download_all_icons(icons_to_download, size=args.size, clear_existing=clear_existing)
\ No newline at end of file
+    success_count, failed_icons = download_all_icons(
+        icons_to_download, size=args.size, clear_existing=clear_existing, refresh_cache=args.refresh
+    )
\ No newline at end of file
@@ -8,14 +8,11 @@ import os
 
 def create_pattern_image(width=40, height=40):
     """创建棋盘图案"""
-    image = Image.new('L', (width, height), 255)
-    pixels = np.array(image)
-    
-    # 创建棋盘图案
-    for y in range(height):
-        for x in range(width):
-            if (x // 5 + y // 5) % 2 == 0:
-                pixels[y, x] = 0
+    # 创建棋盘图案（5x5像素为一格）
+    yy, xx = np.mgrid[0:height, 0:width]
+    mask = (xx // 5 + yy // 5) % 2 == 0
+    pixels = np.full((height, width), 255, np.uint8)
+    pixels[mask] = 0
     
     return Image.fromarray(pixels, 'L')
 
@@ -55,32 +52,34 @@ def create_icon_image(width=40, height=40):
     # 内圆
     draw.ellipse([(15, 15), (width-15, height-15)], outline=0, width=2)
     
-    # 齿轮齿
+    # 齿轮齿（8个，间隔45度，预先计算三角函数表）
+    angles = np.deg2rad(np.arange(0, 360, 45))
+    cos_a, sin_a = np.cos(angles), np.sin(angles)
     for i in range(8):
-        angle = i * 45
-        x1 = center_x + 15 * np.cos(np.radians(angle))
-        y1 = center_y + 15 * np.sin(np.radians(angle))
-        x2 = center_x + 20 * np.cos(np.radians(angle))
-        y2 = center_y + 20 * np.sin(np.radians(angle))
+        x1 = center_x + 15 * cos_a[i]
+        y1 = center_y + 15 * sin_a[i]
+        x2 = center_x + 20 * cos_a[i]
+        y2 = center_y + 20 * sin_a[i]
         draw.line([(x1, y1), (x2, y2)], fill=0, width=2)
     
     return image
 
 def create_landscape_image(width=296, height=152):
     """创建风景示例"""
+    sky_height = height // 2
+    
+    # 天空渐变（上半部分逐行从255过渡到155）
+    # 只构建天空部分的数组，一次性贴到白色画布上
+    gradient = (255 - np.arange(sky_height) / sky_height * 100).astype(np.uint8)
+    sky = gradient.repeat(width).reshape(sky_height, width)
     image = Image.new('L', (width, height), 255)
+    image.paste(Image.fromarray(sky, 'L'), (0, 0))
     draw = ImageDraw.Draw(image)
     
-    # 天空渐变
-    for y in range(height // 2):
-        gray_value = int(255 - (y / (height // 2)) * 100)
-        draw.line([(0, y), (width, y)], fill=gray_value)
-    
     # 山峰轮廓
-    mountain_points = []
-    for x in range(0, width, 20):
-        y = height // 2 + 20 * np.sin(x * 0.02) + 10 * np.sin(x * 0.05)
-        mountain_points.append((x, int(y)))
+    xs = np.arange(0, width, 20)
+    ys = (sky_height + 20 * np.sin(xs * 0.02) + 10 * np.sin(xs * 0.05)).astype(int)
+    mountain_points = list(zip(xs.tolist(), ys.tolist()))
     mountain_points.append((width, height))
     mountain_points.append((0, height))
     
@@ -104,17 +103,17 @@ def main():
     # 确保输出目录存在
     os.makedirs(output_dir, exist_ok=True)
     
-    # 生成图片
+    # 生成图片（每张约1毫秒，串行生成；进程池的启动开销远大于此）
     images = {
         "sample-40x40-pattern.png": create_pattern_image(40, 40),
-        "sample-296x152-text.png": create_text_image(296, 152), 
+        "sample-296x152-text.png": create_text_image(296, 152),
         "sample-40x40-icon.png": create_icon_image(40, 40),
         "sample-296x152-landscape.png": create_landscape_image(296, 152)
     }
     
     for filename, image in images.items():
         filepath = os.path.join(output_dir, filename)
-        image.save(filepath)
+        image.save(filepath, "PNG", compress_level=1, optimize=False)
         print(f"已生成: {filepath}")
     
     print("所有示例图片生成完成！")